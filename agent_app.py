@@ -1,6 +1,7 @@
 import os
+import json
 import requests
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template
 from notion_client import Client
 import sys
 
@@ -8,6 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from agent_core import run_agent_executor
+from agent_batch import run_batch_executor
 from agent_tools import load_api_keys_and_clients
 
 # Initialize the Flask application
@@ -139,5 +141,29 @@ def run_agent_api():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/run-batch', methods=['POST'])
+def run_batch_api():
+    """Receives a list of user queries and streams the batch progress and answers as JSON lines."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('queries'), list):
+        return jsonify({'error': 'Expected a JSON object with a list of queries'}), 400
+    user_queries = data['queries']
+    if not user_queries:
+        return jsonify({'error': 'Queries not provided'}), 400
+    # Results are matched to queries by position, so invalid entries are rejected rather than skipped
+    if not all(isinstance(q, str) and q.strip() for q in user_queries):
+        return jsonify({'error': 'Every query must be a non-empty string'}), 400
+
+    def generate():
+        try:
+            for result in run_batch_executor(user_queries, NOTION_DATABASE_ID):
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        except Exception as e:
+            print(f"Error during batch invocation: {e}", file=sys.stderr)
+            yield json.dumps({'index': None, 'error': str(e)}) + "\n"
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,280 @@
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Set, Tuple, Iterator, Optional
+
+# Append the current directory to the Python path to allow local imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agent_tools import (
+    NOTION_DATABASE_ID,
+    AVAILABLE_SUBJECT_TYPES,
+    load_api_keys_and_clients,
+    analyze_queries_and_map_subjects_batch,
+    tool_get_urls_from_notion_by_topics,
+    tool_get_relevant_articles_from_homepage,
+    tool_get_article_paragraphs,
+    tool_answer_question_with_llm_and_urls
+)
+
+MAX_ARTICLES_PER_QUESTION = 5
+MAX_WORKERS = 8
+
+
+def _parse_analysis(analysis: str) -> Tuple[List[str], List[str]]:
+    """
+    Parses 'Keywords: [...] ||| Subjects: [...]' into (keywords, subjects). Each list is read
+    up to its closing ']' or the end of its line, so code fences or a trailing explanation
+    from the LLM are ignored, and only subjects from AVAILABLE_SUBJECT_TYPES are kept.
+    """
+    if "Keywords:" not in analysis or "Subjects:" not in analysis:
+        return [], []
+    keywords_str = analysis.split("Keywords:", 1)[1].split("|||", 1)[0].strip().split('\n', 1)[0].split(']', 1)[0]
+    subjects_str = analysis.split("Subjects:", 1)[1].strip().split('\n', 1)[0].split(']', 1)[0]
+    keywords = [k.strip(' "\'[]`') for k in keywords_str.split(',')]
+    subjects = [s.strip(' "\'[]`.').lower() for s in subjects_str.split(',')]
+    return ([k for k in keywords if k and k.lower() != "none"],
+            [s for s in dict.fromkeys(subjects) if s in AVAILABLE_SUBJECT_TYPES])
+
+
+def _parse_article_listing(listing: str) -> Set[Tuple[str, str]]:
+    """Parses the output of tool_get_relevant_articles_from_homepage into (title, url) pairs."""
+    articles = set()
+    for line in listing.split('\n'):
+        if not line.startswith("Title: ") or " | URL: " not in line:
+            continue
+        title, url = line[len("Title: "):].rsplit(" | URL: ", 1)
+        articles.add((title.strip(), url.strip()))
+    return articles
+
+
+def _select_articles(candidates: Set[Tuple[str, str]], keywords: List[str]) -> List[Tuple[str, str]]:
+    """
+    Picks the articles matching a question's keywords, ranked by the number of
+    keywords found in the title, mirroring the agent's "3-5 most relevant" step.
+    """
+    lowered_keywords = [kw.lower() for kw in keywords]
+    scored = []
+    for title, url in candidates:
+        if lowered_keywords:
+            score = sum(1 for kw in lowered_keywords if kw in title.lower())
+            if not score:
+                continue
+        else:
+            score = 0
+        scored.append((score, title, url))
+    scored.sort(key=lambda item: (-item[0], item[2]))
+
+    selected, seen_urls = [], set()
+    for _, title, url in scored:
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        selected.append((title, url))
+        if len(selected) >= MAX_ARTICLES_PER_QUESTION:
+            break
+    return selected
+
+
+def _format_article_entry(title: str, url: str, paragraphs: str) -> str:
+    """Builds one 'Original Title: ... | URL: ... | Content: ...' entry for the answer tool."""
+    fields = {"H1 Title": "N/A", "H2 Subtitle": "N/A", "Content": "No content available."}
+    for part in paragraphs.split(" ||| ", 2):
+        if ": " in part:
+            key, value = part.split(": ", 1)
+            fields[key.strip()] = value.strip()
+    # The answer tool expects one article per line
+    content = " ".join(fields["Content"].split())
+    return (f"Original Title: {title} | H1 Title: {fields['H1 Title']} | "
+            f"H2 Subtitle: {fields['H2 Subtitle']} | URL: {url} | Content: {content}")
+
+
+def _is_tool_error(tool_output: str) -> bool:
+    """Tells whether a tool returned one of its error strings instead of a result."""
+    return tool_output.startswith(("Error", "An unexpected error", "An error occurred"))
+
+
+def _batch_result(index: int, question: str, answer: Optional[str], fetched: List[Tuple[str, str]], errors: List[str]) -> Dict:
+    """Builds one JSONL record of the batch output. Only fetched articles are reported as sources."""
+    return {
+        'index': index,
+        'question': question,
+        'answer': answer,
+        'sources': [url for _, url in fetched],
+        'error': "; ".join(dict.fromkeys(errors)) or None
+    }
+
+
+def _progress(stage: str, done: int, total: int) -> Dict:
+    """Builds one progress record, sent while the shared crawl stages are running."""
+    return {'progress': stage, 'done': done, 'total': total}
+
+
+def run_batch_executor(user_queries: List[str], NOTION_DATABASE_ID: str) -> Iterator[Dict]:
+    """
+    Answers many questions while sharing the crawl work between them.
+
+    Unlike run_agent_executor, which re-crawls every homepage and article per question,
+    this runs a fixed pipeline: all queries are analyzed with concurrent LLM calls, each
+    subject is looked up in Notion once, each homepage is scraped once (with the union
+    of keywords of the questions that need it) and each selected article is fetched once.
+    Answers are then generated in parallel against the shared article set.
+
+    Args:
+        user_queries (List[str]): The questions to answer.
+        NOTION_DATABASE_ID (str): The ID of the Notion database.
+
+    Yields:
+        dict: Progress records with the keys 'progress', 'done' and 'total', sent before
+        and during the shared stages so a streaming client is not left waiting in silence,
+        followed by one result per question, in completion order, with the keys
+        'index', 'question', 'answer', 'sources' and 'error'. 'error' is None unless the
+        analysis failed or found no known subject, or a Notion lookup, a homepage scrape,
+        every article fetch or the answer generation failed for that question; 'answer' is None when nothing could be gathered to answer from.
+    """
+    # 1. Analyze all queries with concurrent LLM calls
+    analyses: List[str] = [""] * len(user_queries)
+    yield _progress('analyze', 0, len(user_queries))
+    for done, (index, analysis) in enumerate(
+            analyze_queries_and_map_subjects_batch(user_queries, AVAILABLE_SUBJECT_TYPES), 1):
+        analyses[index] = analysis
+        yield _progress('analyze', done, len(user_queries))
+    parsed = [_parse_analysis(analysis) for analysis in analyses]
+    errors_by_question: List[List[str]] = []
+    for analysis, (_, subjects) in zip(analyses, parsed):
+        if _is_tool_error(analysis):
+            errors_by_question.append([analysis])
+        elif not subjects:
+            errors_by_question.append([f"Query analysis found no subject among "
+                                       f"{', '.join(AVAILABLE_SUBJECT_TYPES)}: {analysis.strip()}"])
+        else:
+            errors_by_question.append([])
+
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        # 2. Look up each distinct subject in Notion exactly once
+        subjects = sorted({subject for _, question_subjects in parsed for subject in question_subjects})
+        urls_futures = {executor.submit(tool_get_urls_from_notion_by_topics,
+                                        f"{NOTION_DATABASE_ID}|||{subject}"): subject
+                        for subject in subjects}
+        urls_by_subject: Dict[str, List[str]] = {}
+        subject_errors: Dict[str, str] = {}
+        yield _progress('notion', 0, len(urls_futures))
+        for done, future in enumerate(as_completed(urls_futures), 1):
+            subject = urls_futures[future]
+            urls_output = future.result()
+            if _is_tool_error(urls_output):
+                subject_errors[subject] = urls_output
+            urls_by_subject[subject] = [line.strip() for line in urls_output.split('\n')
+                                        if line.strip().startswith(('http://', 'https://'))]
+            yield _progress('notion', done, len(urls_futures))
+
+        homepages_by_question: List[List[str]] = []
+        keywords_by_homepage: Dict[str, Set[str]] = {}
+        unrestricted_homepages: Set[str] = set()
+        for (keywords, question_subjects), errors in zip(parsed, errors_by_question):
+            errors.extend(subject_errors[subject] for subject in question_subjects if subject in subject_errors)
+            homepages = list(dict.fromkeys(url for subject in question_subjects for url in urls_by_subject[subject]))
+            homepages_by_question.append(homepages)
+            for homepage in homepages:
+                keywords_by_homepage.setdefault(homepage, set()).update(kw.lower() for kw in keywords)
+                if not keywords:
+                    unrestricted_homepages.add(homepage)
+
+        # 3. Scrape each homepage once, with the union of the keywords of every question that needs it
+        homepage_futures = {}
+        for homepage, keywords in keywords_by_homepage.items():
+            keywords_str = "" if homepage in unrestricted_homepages else ",".join(sorted(keywords))
+            homepage_futures[executor.submit(tool_get_relevant_articles_from_homepage,
+                                             f"{homepage}|||{keywords_str}")] = homepage
+        articles_by_homepage: Dict[str, Set[Tuple[str, str]]] = {}
+        homepage_errors: Dict[str, str] = {}
+        yield _progress('homepages', 0, len(homepage_futures))
+        for done, future in enumerate(as_completed(homepage_futures), 1):
+            homepage = homepage_futures[future]
+            listing = future.result()
+            if _is_tool_error(listing):
+                homepage_errors[homepage] = listing
+            articles_by_homepage[homepage] = _parse_article_listing(listing)
+            yield _progress('homepages', done, len(homepage_futures))
+
+        # 4. Select articles per question and fetch each distinct article once
+        selected_by_question: List[List[Tuple[str, str]]] = []
+        for (keywords, _), homepages, errors in zip(parsed, homepages_by_question, errors_by_question):
+            errors.extend(homepage_errors[homepage] for homepage in homepages if homepage in homepage_errors)
+            candidates = set().union(*(articles_by_homepage[homepage] for homepage in homepages))
+            selected_by_question.append(_select_articles(candidates, keywords))
+        article_urls = {url for selected in selected_by_question for _, url in selected}
+        paragraph_futures = {executor.submit(tool_get_article_paragraphs, url): url for url in article_urls}
+        paragraphs_by_url: Dict[str, str] = {}
+        yield _progress('articles', 0, len(paragraph_futures))
+        for done, future in enumerate(as_completed(paragraph_futures), 1):
+            paragraphs_by_url[paragraph_futures[future]] = future.result()
+            yield _progress('articles', done, len(paragraph_futures))
+
+        # 5. Generate the answers in parallel and stream them as they complete
+        answer_futures = {}
+        fetched_by_question: List[List[Tuple[str, str]]] = []
+        for index, (user_query, selected) in enumerate(zip(user_queries, selected_by_question)):
+            fetched = [(title, url) for title, url in selected if paragraphs_by_url[url].startswith("H1 Title:")]
+            fetched_by_question.append(fetched)
+            if selected and not fetched:
+                errors_by_question[index].extend(paragraphs_by_url[url] for _, url in selected)
+            articles_data = "\n".join(_format_article_entry(title, url, paragraphs_by_url[url])
+                                      for title, url in fetched)
+            if errors_by_question[index] and not articles_data:
+                # A failure upstream left nothing to answer from; report it instead of "no information"
+                yield _batch_result(index, user_queries[index], None, fetched, errors_by_question[index])
+                continue
+            future = executor.submit(tool_answer_question_with_llm_and_urls, f"{user_query}|||{articles_data}")
+            answer_futures[future] = index
+
+        for future in as_completed(answer_futures):
+            index = answer_futures[future]
+            answer = future.result()
+            errors = errors_by_question[index]
+            if _is_tool_error(answer):
+                errors.append(answer)
+                answer = None
+            yield _batch_result(index, user_queries[index], answer, fetched_by_question[index], errors)
+    finally:
+        # If the consumer stops early (e.g. a /run-batch client disconnects), drop the queued work
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def read_questions_file(path: str) -> List[str]:
+    """Reads one question per line, skipping blank lines and '#' comments."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a file of questions in batch and stream the results as JSONL.")
+    parser.add_argument("questions_file", help="Text file with one question per line.")
+    parser.add_argument("-o", "--output", help="Write the JSONL results to this file instead of stdout.")
+    args = parser.parse_args()
+
+    try:
+        load_api_keys_and_clients()
+        user_queries = read_questions_file(args.questions_file)
+    except Exception as e:
+        print(f"Error initializing: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for result in run_batch_executor(user_queries, NOTION_DATABASE_ID):
+            if 'progress' in result:
+                print(f"[{result['progress']}] {result['done']}/{result['total']}", file=sys.stderr)
+                continue
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
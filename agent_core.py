@@ -10,7 +10,8 @@ from agent_tools import (
     tool_get_urls_from_notion_by_topics,
     tool_get_relevant_articles_from_homepage,
     tool_get_article_paragraphs,
-    tool_answer_question_with_llm_and_urls
+    tool_answer_question_with_llm_and_urls,
+    AVAILABLE_SUBJECT_TYPES
 )
 
 
@@ -26,6 +27,8 @@ def run_agent_executor(user_query: str, NOTION_DATABASE_ID: str) -> str:
         str: The final answer generated by the agent.
     """
     try:
+        subject_types_str = ",".join(AVAILABLE_SUBJECT_TYPES)
+
         # Define the tools
         tools = [
             Tool(
@@ -33,7 +36,7 @@ def run_agent_executor(user_query: str, NOTION_DATABASE_ID: str) -> str:
                 func=tool_analyze_query_and_map_subjects,
                 description="Analyzes a user query to extract relevant keywords and map it to subject categories. "
                             "Input should be a string: 'user_query ||| comma_separated_list_of_available_types'. "
-                            "Example: 'What are the latest tech innovations? ||| sport,news,science,tech,economy'. "
+                            f"Example: 'What are the latest tech innovations? ||| {subject_types_str}'. "
                             "Returns a formatted string: 'Keywords: [comma-separated-keywords or None] ||| Subjects: [comma-separated-subjects or None]'."
             ),
             Tool(
@@ -89,7 +92,7 @@ def run_agent_executor(user_query: str, NOTION_DATABASE_ID: str) -> str:
             f"Your goal is to answer the question: '{user_query}'. "
             f"Follow these steps: "
             f"1. Analyze the user's question to extract keywords and map it to relevant subject categories "
-            f"   from the list: 'sport,news,science,tech,economy' using the 'AnalyzeQueryAndMapSubjects' tool. "
+            f"   from the list: '{subject_types_str}' using the 'AnalyzeQueryAndMapSubjects' tool. "
             f"   The tool will return a string like 'Keywords: [keywords] ||| Subjects: [subjects]'. "
             f"2. Use the identified subjects from the previous step to fetch relevant website URLs from the Notion database "
             f"   using the 'GetUrlsFromNotionByTopics' tool. "
@@ -2,7 +2,7 @@ import os
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterator
 from langchain.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from notion_client import Client
@@ -12,6 +12,8 @@ import re
 # --- Global variables for Notion and keys ---
 notion: Client = None
 NOTION_DATABASE_ID = "20d26c2f146480a782afedbbb797cfb2"  # NOTE: This is hardcoded from your original file.
+AVAILABLE_SUBJECT_TYPES = ["sport", "news", "science", "tech", "economy"]
+LLM_BATCH_MAX_CONCURRENCY = 8  # Upper bound on parallel Gemini requests in batch calls
 
 
 def load_api_keys_and_clients():
@@ -55,6 +57,23 @@ def _get_llm_response_for_tool(prompt_template_string: str, input_variables: dic
     return response.content
 
 
+def _get_llm_responses_for_tool_batch(prompt_template_string: str,
+                                      input_variables_list: List[dict]) -> Iterator[Tuple[int, str]]:
+    """
+    Batched variant of _get_llm_response_for_tool. The prompts are sent as separate requests
+    running concurrently (at most LLM_BATCH_MAX_CONCURRENCY at a time), and (index, response)
+    pairs are yielded as each one completes. Failed items are returned as error strings.
+    """
+    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.7)
+    prompt = PromptTemplate.from_template(prompt_template_string)
+    chain = prompt | llm
+    responses = chain.batch_as_completed(input_variables_list,
+                                         config={"max_concurrency": LLM_BATCH_MAX_CONCURRENCY},
+                                         return_exceptions=True)
+    for index, response in responses:
+        yield index, f"Error: {response}" if isinstance(response, Exception) else response.content
+
+
 # --- Agent Tools (Copied from your original script) ---
 def tool_get_relevant_articles_from_homepage(input_string: str) -> str:
     """
@@ -307,6 +326,15 @@ def tool_get_article_paragraphs(article_url_string: str) -> str:
         return f"An unexpected error occurred while processing {article_url_string}: {e}"
 
 
+ANALYZE_QUERY_PROMPT_TEMPLATE = """
+        Given the user query: "{query}" and the available subject categories: [{types_list}]
+        1. Extract the most important keywords or key phrases from the query.
+        2. Identify the most relevant subject categories from the provided list.
+        Return the results in the exact format: "Keywords: [comma-separated-keywords or None] ||| Subjects: [comma-separated-subjects or None]"
+        Please write the category names in lower case.
+        """
+
+
 def tool_analyze_query_and_map_subjects(input_string: str) -> str:
     """
     Analyzes a user query to extract relevant keywords and map it to subject categories.
@@ -320,16 +348,9 @@ def tool_analyze_query_and_map_subjects(input_string: str) -> str:
         available_website_types = [t.strip() for t in available_website_types_str.split(',') if t.strip()]
         if not available_website_types:
             return "Error: No available website types provided in the input."
-        prompt_template = """
-        Given the user query: "{query}" and the available subject categories: [{types_list}]
-        1. Extract the most important keywords or key phrases from the query.
-        2. Identify the most relevant subject categories from the provided list.
-        Return the results in the exact format: "Keywords: [comma-separated-keywords or None] ||| Subjects: [comma-separated-subjects or None]"
-        Please write the category names in lower case.
-        """
         types_list_str = ", ".join(available_website_types)
         input_vars = {"query": user_query, "types_list": types_list_str}
-        raw_response = _get_llm_response_for_tool(prompt_template, input_vars)
+        raw_response = _get_llm_response_for_tool(ANALYZE_QUERY_PROMPT_TEMPLATE, input_vars)
         if "Keywords:" in raw_response and "Subjects:" in raw_response:
             return raw_response
         else:
@@ -338,6 +359,33 @@ def tool_analyze_query_and_map_subjects(input_string: str) -> str:
         return f"Error in analyze_query_and_map_subjects tool: {e}"
 
 
+def analyze_queries_and_map_subjects_batch(user_queries: List[str],
+                                           available_website_types: List[str]) -> Iterator[Tuple[int, str]]:
+    """
+    Batched version of tool_analyze_query_and_map_subjects. Analyzes all queries with
+    concurrent LLM calls and yields (index, 'Keywords: ... ||| Subjects: ...') pairs as
+    each analysis completes, where index is the position of the query in the input.
+    """
+    if not available_website_types:
+        for index in range(len(user_queries)):
+            yield index, "Error: No available website types provided in the input."
+        return
+    types_list_str = ", ".join(available_website_types)
+    input_vars_list = [{"query": user_query.strip(), "types_list": types_list_str} for user_query in user_queries]
+    pending = set(range(len(user_queries)))
+    try:
+        for index, raw_response in _get_llm_responses_for_tool_batch(ANALYZE_QUERY_PROMPT_TEMPLATE, input_vars_list):
+            pending.discard(index)
+            # Errors are passed through so batch callers can report them instead of answering blindly
+            if raw_response.startswith("Error") or ("Keywords:" in raw_response and "Subjects:" in raw_response):
+                yield index, raw_response
+            else:
+                yield index, "Keywords: None ||| Subjects: None"
+    except Exception as e:
+        for index in sorted(pending):
+            yield index, f"Error in analyze_query_and_map_subjects tool: {e}"
+
+
 def tool_answer_question_with_llm_and_urls(input_string: str) -> str:
     """
     Takes the user's question and processed article data, sends it to an LLM